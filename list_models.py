@@ -1,7 +1,18 @@
 import os
-from google import genai
+import argparse
+from itertools import islice
 from dotenv import load_dotenv
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+parser = argparse.ArgumentParser(description="List the Gemini models available to your API key")
+parser.add_argument("--limit", type=positive_int, default=None, help="Only fetch and print the first N models")
+args = parser.parse_args()
+
 load_dotenv("src/agent_creator/.env") # Load from specific location if needed, or just .env
 
 api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
@@ -9,12 +20,13 @@ if not api_key:
     print("No API key found")
     exit(1)
 
-client = genai.Client(api_key=api_key)
-
 try:
+    from google import genai
+
+    client = genai.Client(api_key=api_key)
     print("Listing models...")
-    # In google-genai, it might be client.models.list()
-    for model in client.models.list():
-        print(model.name)
+    # client.models.list() pages lazily; size pages to the limit and stop once it is reached
+    models = client.models.list(config={"page_size": args.limit} if args.limit is not None else None)
+    print("\n".join(model.name for model in islice(models, args.limit)))
 except Exception as e:
     print(f"Error listing models: {e}")
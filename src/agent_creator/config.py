@@ -1,14 +1,62 @@
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-class Config:
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-    AGENT_MODEL = os.getenv("AGENT_MODEL", "gpt-4-turbo")
-    MAX_TOKENS = int(os.getenv("MAX_TOKENS", 4096))
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    LLM_PROVIDER = os.getenv("LLM_PROVIDER", "google")
-    GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Optional
+from dotenv import dotenv_values
+
+
+@dataclass(frozen=True)
+class _Config:
+    # Each field is read from the environment variable of the same name
+    GEMINI_API_KEY: Optional[str] = None
+    OPENAI_API_KEY: Optional[str] = None
+    ANTHROPIC_API_KEY: Optional[str] = None
+    AGENT_MODEL: str = "gpt-4-turbo"
+    MAX_TOKENS: int = 4096
+    LOG_LEVEL: str = "INFO"
+    LLM_PROVIDER: str = "google"
+    GOOGLE_API_KEY: Optional[str] = None
+    LLM_CACHE_TTL: int = 3600
+    LLM_CACHE_SIZE: int = 256
+    LLM_MAX_CONCURRENCY: int = 5
+    AGENT_LOGS_PRETTY: bool = False
+
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def _parse(raw: str, type_: type):
+    if type_ is bool:
+        return raw.strip().lower() in _TRUE_VALUES
+    if type_ in (int, float):
+        return type_(raw)
+    return raw
+
+
+@lru_cache(maxsize=1)
+def get_config() -> _Config:
+    """
+    Load settings once per process.
+
+    The .env file is parsed a single time; its values only fill in keys that
+    are not already set in the real environment, matching load_dotenv().
+    """
+    for key, value in dotenv_values().items():
+        if value is not None:
+            os.environ.setdefault(key, value)
+
+    env = os.environ
+    values = {}
+    for field in fields(_Config):
+        if field.name in env:
+            values[field.name] = _parse(env[field.name], field.type)
+    return _Config(**values)
+
+
+def clear_config_cache() -> None:
+    """Drop the cached settings so the next get_config() re-reads the environment."""
+    get_config.cache_clear()
+
+
+# Backward-compatible module-level handle (Config.LLM_PROVIDER etc.)
+Config = get_config()
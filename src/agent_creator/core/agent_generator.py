@@ -1,8 +1,10 @@
 from typing import Dict, Any, Optional
+import asyncio
 import os
 from utils.logger import log_event
+from .agent_setup import AgentConfig
 
-def create_agent_a2a(agent_config: Dict[str, Any], output_base_path: Optional[str] = None) -> Dict[str, Any]:
+async def create_agent_a2a(agent_config: AgentConfig, output_base_path: Optional[str] = None) -> Dict[str, Any]:
     """
     Generates a fully functional, A2A-compatible agent Python file.
     
@@ -13,37 +15,34 @@ def create_agent_a2a(agent_config: Dict[str, Any], output_base_path: Optional[st
     - Can be imported and used standalone or in agent networks
     
     Args:
-        agent_config: Agent configuration dictionary (must include 'selected_model')
+        agent_config: Agent configuration (must include 'selected_model')
         output_base_path: Base directory for generated agents (defaults to 'agents/generated')
     """
-    log_event("AGENT_GENERATION_START", agent_id=agent_config["agent_id"])
+    log_event("AGENT_GENERATION_START", agent_id=agent_config.agent_id)
     
     # Validate required model configuration
-    if "selected_model" not in agent_config:
+    if agent_config.selected_model is None:
         raise ValueError(
             "Agent configuration must include 'selected_model'. "
             "Ensure llm_selector has been run and model is selected."
         )
     
-    model_name = agent_config["selected_model"]
-    agent_name = agent_config["agent_type"].replace(" ", "_").lower()
-    file_name = f"{agent_name}_{agent_config['agent_id'][:8]}.py"
+    model_name = agent_config.selected_model
+    agent_name = agent_config.agent_type.replace(" ", "_").lower()
+    file_name = f"{agent_name}_{agent_config.agent_id[:8]}.py"
     
     # Construct output path: base_path/agent_name/
     if output_base_path is None:
         output_base_path = "agents/generated"
     
     output_path = os.path.join(output_base_path, agent_name)
-    
-    # Ensure output directory exists
-    os.makedirs(output_path, exist_ok=True)
     full_path = os.path.join(output_path, file_name)
     
     # Generate comprehensive Python code for A2A agent
     code = f'''"""
-Auto-generated Agent: {agent_config['agent_type']}
+Auto-generated Agent: {agent_config.agent_type}
 Generated by Agent Creator System
-Agent ID: {agent_config['agent_id']}
+Agent ID: {agent_config.agent_id}
 
 This agent is designed to be pluggable into A2A (Agent-to-Agent) systems.
 """
@@ -59,21 +58,21 @@ load_dotenv()
 
 class {agent_name.title().replace('_', '')}Agent:
     """
-    {agent_config['agent_type']} Agent
+    {agent_config.agent_type} Agent
     
     Capabilities:
-{chr(10).join(f"    - {cap}" for cap in agent_config['capabilities'])}
+{chr(10).join(f"    - {cap}" for cap in agent_config.capabilities)}
     
     System Prompt:
-    {agent_config['system_prompt']}
+    {agent_config.system_prompt}
     """
     
     def __init__(self, api_key: Optional[str] = None):
         """Initialize the agent with LLM client."""
-        self.agent_id = "{agent_config['agent_id']}"
-        self.agent_type = "{agent_config['agent_type']}"
-        self.capabilities = {agent_config['capabilities']}
-        self.system_prompt = """{agent_config['system_prompt']}"""
+        self.agent_id = "{agent_config.agent_id}"
+        self.agent_type = "{agent_config.agent_type}"
+        self.capabilities = {agent_config.capabilities}
+        self.system_prompt = """{agent_config.system_prompt}"""
         
         # Initialize LLM client
         api_key = api_key or os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
@@ -185,20 +184,27 @@ if __name__ == "__main__":
 '''
     
     try:
-        with open(full_path, "w") as f:
-            f.write(code)
+        # Disk I/O runs in a worker thread so the event loop stays free
+        await asyncio.to_thread(_write_agent_file, output_path, full_path, code)
             
         log_event("AGENT_GENERATION_SUCCESS", 
                  file_path=full_path,
-                 agent_type=agent_config['agent_type'],
+                 agent_type=agent_config.agent_type,
                  model=model_name)
         
         return {
             "success": True,
             "endpoint": full_path,
-            "agent_id": agent_config["agent_id"],
+            "agent_id": agent_config.agent_id,
             "agent_class": f"{agent_name.title().replace('_', '')}Agent"
         }
     except Exception as e:
         log_event("AGENT_GENERATION_ERROR", error=str(e))
         raise
+
+
+def _write_agent_file(output_path: str, full_path: str, code: str) -> None:
+    # Ensure output directory exists
+    os.makedirs(output_path, exist_ok=True)
+    with open(full_path, "w") as f:
+        f.write(code)
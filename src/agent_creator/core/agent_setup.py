@@ -1,24 +1,56 @@
-from typing import Dict, Any
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+from .llm_selector import ModelSelection
 
-def get_agent_setup_data(structured_instruction: Dict[str, Any]) -> Dict[str, Any]:
+_SYS_PROMPT_TMPL = "You are a {agent_type}. Your capabilities include: {caps}. Constraints: {cons}."
+
+@dataclass(slots=True)
+class AgentConfig:
+    """Agent configuration carried through every genesis stage"""
+    agent_id: str
+    agent_type: str
+    capabilities: List[str]
+    constraints: List[str]
+    success_criteria: str
+    system_prompt: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    selected_model: Optional[str] = None
+    model_temperature: Optional[float] = None
+    model_context_window: Optional[int] = None
+
+def get_agent_setup_data(
+    structured_instruction: Dict[str, Any],
+    llm_instance: Optional[ModelSelection] = None
+) -> AgentConfig:
     """
     Create initial agent setup configuration from structured instructions.
-    """
-    import uuid
     
-    agent_id = str(uuid.uuid4())
+    When the model has already been selected, its fields are filled in here
+    so the configuration is complete on construction.
+    """
+    agent_id = uuid.uuid4().hex
+    capabilities = structured_instruction.get("capabilities", [])
+    constraints = structured_instruction.get("constraints", [])
     
     # Basic configuration setup
-    config = {
-        "agent_id": agent_id,
-        "agent_type": structured_instruction.get("agent_type", "general"),
-        "capabilities": structured_instruction.get("capabilities", []),
-        "constraints": structured_instruction.get("constraints", []),
-        "success_criteria": structured_instruction.get("success_criteria", ""),
-        "system_prompt": f"You are a {structured_instruction.get('agent_type', 'assistant')}. "
-                         f"Your capabilities include: {', '.join(structured_instruction.get('capabilities', []))}. "
-                         f"Constraints: {', '.join(structured_instruction.get('constraints', []))}.",
-        "metadata": structured_instruction.get("_metadata", {})
-    }
+    config = AgentConfig(
+        agent_id=agent_id,
+        agent_type=structured_instruction.get("agent_type", "general"),
+        capabilities=capabilities,
+        constraints=constraints,
+        success_criteria=structured_instruction.get("success_criteria", ""),
+        system_prompt=_SYS_PROMPT_TMPL.format_map({
+            "agent_type": structured_instruction.get("agent_type", "assistant"),
+            "caps": ", ".join(capabilities),
+            "cons": ", ".join(constraints)
+        }),
+        metadata=structured_instruction.get("_metadata", {})
+    )
+    
+    if llm_instance is not None:
+        config.selected_model = llm_instance.model_name
+        config.model_temperature = llm_instance.temperature
+        config.model_context_window = llm_instance.context_window
     
     return config
@@ -0,0 +1,102 @@
+from typing import Dict, Any, Tuple
+from llm.factory import get_llm_client
+from utils.logger import log_event
+from .mdp_converter import MDP_SCHEMA, MDP_SYSTEM_INSTRUCTION, build_mdp_prompt
+from .llm_selector import ModelSelection, MODEL_CHOICES, SELECTION_EXAMPLE, SELECTION_SCHEMA, parse_model_selection, select_from_table
+
+# Union of the MDP and model-selection schemas, answered in one round-trip
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    # model_selection is only used when the complexity has no MODEL_TABLE entry
+    "required": ["structured_instruction"],
+    "properties": {
+        "structured_instruction": MDP_SCHEMA,
+        "model_selection": SELECTION_SCHEMA
+    }
+}
+
+
+async def analyze_and_select(instruction: str) -> Tuple[Dict[str, Any], ModelSelection]:
+    """
+    Run MDP conversion and model selection as a single LLM request.
+
+    Both stages only depend on the original instruction, so one prompt asks
+    for the structured configuration and the recommended Gemini model
+    together, halving the round-trips made before QA starts.
+    """
+    log_event("ANALYSIS_START", instruction_length=len(instruction))
+
+    llm = get_llm_client()
+
+    prompt = f"""{build_mdp_prompt(instruction)}
+
+Then act as an AI model selection expert: based on that configuration, recommend
+the optimal Google Gemini model considering task complexity vs cost, context window
+requirements, specific capability needs and budget constraints.
+
+{MODEL_CHOICES}
+
+Return ONLY valid JSON with exactly two top-level keys:
+{{
+    "structured_instruction": {{ the extracted configuration }},
+    "model_selection": {SELECTION_EXAMPLE}
+}}"""
+
+    try:
+        # Only replies that _resolve accepts are cached, so a malformed one is never replayed
+        response = await llm.agenerate_json(
+            prompt=prompt,
+            system_instruction=MDP_SYSTEM_INSTRUCTION,
+            schema=ANALYSIS_SCHEMA,
+            accept=lambda r: _resolve(r["parsed_json"])
+        )
+
+        structured_config, model_selection = _resolve(response["parsed_json"])
+        structured_config["_metadata"] = {
+            "tokens_used": response["total_tokens"],
+            "api_cost": response["cost_usd"],
+            "model": response["model"]
+        }
+
+        log_event("ANALYSIS_SUCCESS",
+                 agent_type=structured_config["agent_type"],
+                 selected_model=model_selection.model_name,
+                 reasoning=model_selection.reasoning,
+                 tokens=response["total_tokens"],
+                 cost=response["cost_usd"])
+
+        return structured_config, model_selection
+
+    except Exception as e:
+        log_event("ANALYSIS_ERROR", error=str(e))
+        raise ValueError(f"Failed to analyze instruction and select model: {e}")
+
+
+def _resolve(analysis: Any) -> Tuple[Dict[str, Any], ModelSelection]:
+    """Validate a combined analysis reply and pick its model; raises ValueError if unusable."""
+    _check_required(analysis, ANALYSIS_SCHEMA, skip=("model_selection",))
+
+    structured_config = analysis["structured_instruction"]
+    # The rule table wins when complexity is known; the LLM's pick is the fallback
+    model_selection = select_from_table(structured_config)
+    if model_selection is None:
+        if "model_selection" not in analysis:
+            raise ValueError("$ is missing required field 'model_selection' "
+                             "(no MODEL_TABLE entry for the estimated complexity)")
+        _check_required(analysis["model_selection"], SELECTION_SCHEMA, "$.model_selection")
+        model_selection = parse_model_selection(analysis["model_selection"])
+    return structured_config, model_selection
+
+
+def _check_required(data: Any, schema: Dict[str, Any], path: str = "$", skip: Tuple[str, ...] = ()) -> None:
+    """Verify required keys of nested object schemas are present, ignoring `skip` properties."""
+    if schema.get("type") != "object":
+        return
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must be a JSON object")
+    for key in schema.get("required", []):
+        if key not in data:
+            raise ValueError(f"{path} is missing required field '{key}'")
+    for key, sub_schema in schema.get("properties", {}).items():
+        if key in data and key not in skip:
+            _check_required(data[key], sub_schema, f"{path}.{key}")
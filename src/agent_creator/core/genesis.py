@@ -1,79 +1,78 @@
+import re
 from typing import Dict, Any
-from utils.logger import log_event
-from .mdp_converter import convert_query_via_mdp
+from utils.logger import log_event, log_enabled
+from .analyzer import analyze_and_select
 from .agent_setup import get_agent_setup_data
-from .llm_selector import select_llm
 from .retry import genesis_retry
-from qa.qa_vet import quality_assurance_test
+from qa.qa_vet import build_qa_suite, run_qa_suite
 from .agent_generator import create_agent_a2a
 
+# At least 10 characters once surrounding whitespace is trimmed (same as len(strip()) >= 10)
+_MIN_CONTENT = re.compile(r"\S.{8,}\S", re.S)
+
 class ValidationError(Exception):
     """Custom exception for input validation failures"""
     pass
 
-def genesis(instruction: str) -> Dict[str, Any]:
+async def genesis(instruction: str) -> Dict[str, Any]:
     """Genesis Agent: Entry point for dynamic agent creation."""
-    log_event("GENESIS_START", instruction_length=len(instruction) if instruction else 0)
+    instruction_length = len(instruction) if instruction else 0
+    log_event("GENESIS_START", instruction_length=instruction_length)
     
     # Input validation
     if not instruction:
         raise ValidationError("Instruction cannot be null or empty")
     
-    if len(instruction.strip()) < 10:
-        raise ValidationError("Instruction too short - provide detailed requirements (min 10 chars)")
-    
-    if len(instruction) > 5000:
+    if instruction_length > 5000:
         raise ValidationError("Instruction too long - please be more concise (max 5000 chars)")
     
-    log_event("VALIDATION_PASSED", instruction_preview=instruction[:100])
+    if not _MIN_CONTENT.search(instruction):
+        raise ValidationError("Instruction too short - provide detailed requirements (min 10 chars)")
+    
+    if log_enabled("VALIDATION_PASSED"):
+        log_event("VALIDATION_PASSED", instruction_preview=instruction[:100])
     
     try:
-        # Process 2: Convert to structured instruction via MDP
-        structured_instruction = convert_query_via_mdp(instruction)
-        
-        # Process 3: Create agent configuration
-        agent_config = get_agent_setup_data(structured_instruction)
+        # Process 2 + 4: Convert to structured instruction via MDP and select LLM in one request
+        structured_instruction, llm_instance = await analyze_and_select(instruction)
         
-        # Process 4: Select LLM
-        llm_instance = select_llm(structured_instruction, agent_config)
-       
-        # Add selected model to agent config for agent generation
-        agent_config["selected_model"] = llm_instance.model_name
-        agent_config["model_temperature"] = llm_instance.temperature
-        agent_config["model_context_window"] = llm_instance.context_window
+        # Process 3: Create agent configuration, including the selected model for agent generation
+        agent_config = get_agent_setup_data(structured_instruction, llm_instance)
         
-        # Process 5: Quality assurance via SPICE testing
-        qa_result = quality_assurance_test(agent_config, llm_instance, structured_instruction)
+        # Process 5: Quality assurance via SPICE testing (suite is reused by retries)
+        qa_suite = await build_qa_suite(structured_instruction)
+        qa_result = await run_qa_suite(qa_suite, agent_config, llm_instance)
         print("qa_result", qa_result)
-        if not qa_result["passed"]:
+        if not qa_result.passed:
             log_event("QA_FAILED", 
-                     agent_id=agent_config["agent_id"],
-                     reason=qa_result["reason"],
-                     test_scores=qa_result["scores"])
+                     agent_id=agent_config.agent_id,
+                     reason=qa_result.reason,
+                     test_scores=qa_result.scores)
             
             # Attempt retry with enhanced configuration (up to 3 attempts)
-            return genesis_retry(
-                qa_result["feedback"],
+            return await genesis_retry(
+                qa_result.feedback,
                 agent_config,
                 llm_instance,
-                structured_instruction
+                structured_instruction,
+                qa_suite=qa_suite
             )
         
         # Process 6: Create Agent class and Register with A2A network
-        a2a_registration = create_agent_a2a(agent_config)
+        a2a_registration = await create_agent_a2a(agent_config)
         
         log_event("GENESIS_SUCCESS",
-                 agent_id=agent_config["agent_id"],
-                 agent_type=agent_config["agent_type"],
-                 qa_scores=qa_result["scores"])
+                 agent_id=agent_config.agent_id,
+                 agent_type=agent_config.agent_type,
+                 qa_scores=qa_result.scores)
         
         return {
             "success": True,
-            "agent_id": agent_config["agent_id"],
-            "agent_type": agent_config["agent_type"],
-            "capabilities": agent_config["capabilities"],
+            "agent_id": agent_config.agent_id,
+            "agent_type": agent_config.agent_type,
+            "capabilities": agent_config.capabilities,
             "a2a_endpoint": a2a_registration["endpoint"],
-            "qa_scores": qa_result["scores"]
+            "qa_scores": qa_result.scores
         }
         
     except Exception as e:
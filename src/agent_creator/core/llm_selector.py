@@ -1,10 +1,10 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from dataclasses import dataclass
-from llm.factory import create_llm_client
+from llm.factory import get_llm_client
 from utils.logger import log_event
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelSelection:
     """Selected model configuration"""
     model_name: str
@@ -14,20 +14,107 @@ class ModelSelection:
     estimated_cost_per_1k: float
 
 
+SELECTION_SCHEMA = {
+    "type": "object",
+    "required": ["model_name", "context_window", "temperature", "reasoning", "estimated_cost_per_1k_tokens"],
+    "properties": {
+        "model_name": {"type": "string"},
+        "context_window": {"type": "integer"},
+        "temperature": {"type": "number"},
+        "reasoning": {"type": "string"},
+        "estimated_cost_per_1k_tokens": {"type": "number"}
+    }
+}
+
+# Shared with the combined analysis call in analyzer.py
+MODEL_CHOICES = """IMPORTANT: You must choose from these Google Gemini models ONLY:
+- gemini-2.0-flash-exp (fastest, cheapest, good for simple tasks)
+- gemini-1.5-flash (balanced, 1M context window)
+- gemini-1.5-pro (most capable, best for complex reasoning)
+- gemini-pro (legacy, general purpose)"""
+
+SELECTION_EXAMPLE = """{
+    "model_name": "gemini-1.5-flash",
+    "context_window": 1000000,
+    "temperature": 0.7,
+    "reasoning": "why this specific Gemini model",
+    "estimated_cost_per_1k_tokens": 0.00015
+}"""
+
+
+# Static model-of-models table: estimated complexity -> Gemini configuration.
+# Resolving from here skips an LLM round-trip whenever complexity is known.
+MODEL_TABLE = {
+    "low": {
+        "model_name": "gemini-2.0-flash-exp",
+        "context_window": 1000000,
+        "temperature": 0.7,
+        "estimated_cost_per_1k_tokens": 0.0001,
+        "reasoning": "Low complexity: fastest and cheapest model is sufficient"
+    },
+    "medium": {
+        "model_name": "gemini-1.5-flash",
+        "context_window": 1000000,
+        "temperature": 0.7,
+        "estimated_cost_per_1k_tokens": 0.00015,
+        "reasoning": "Medium complexity: balanced speed, cost and 1M context window"
+    },
+    "high": {
+        "model_name": "gemini-1.5-pro",
+        "context_window": 2000000,
+        "temperature": 0.4,
+        "estimated_cost_per_1k_tokens": 0.00125,
+        "reasoning": "High complexity: most capable model for complex reasoning"
+    }
+}
+
+
+def select_from_table(structured_instruction: Dict[str, Any]) -> Optional[ModelSelection]:
+    """
+    Pick the model from MODEL_TABLE by estimated complexity.
+    
+    Returns None when the complexity is missing or unrecognised, in which
+    case callers fall back to the LLM-based recommendation.
+    """
+    entry = MODEL_TABLE.get(str(structured_instruction.get("estimated_complexity", "")).lower())
+    if entry is None:
+        return None
+    return parse_model_selection(entry)
+
+
+def parse_model_selection(selection_data: Dict[str, Any]) -> ModelSelection:
+    """Build a ModelSelection from the LLM's JSON recommendation."""
+    return ModelSelection(
+        model_name=selection_data["model_name"],
+        context_window=selection_data["context_window"],
+        temperature=selection_data["temperature"],
+        reasoning=selection_data["reasoning"],
+        estimated_cost_per_1k=selection_data["estimated_cost_per_1k_tokens"]
+    )
+
+
 def select_llm(
     structured_instruction: Dict[str, Any],
-    agent_config: Dict[str, Any]
+    agent_config: Any
 ) -> ModelSelection:
     # TODO: Add support for other models and update prompt
     """
     Use Gemini to select the optimal model configuration.
     This implements "model-of-models" where Gemini helps choose the best setup.
+    Known complexity levels are resolved from MODEL_TABLE without an LLM call.
     """
     log_event("LLM_SELECTION_START", 
              complexity=structured_instruction.get("estimated_complexity"))
     
+    model_selection = select_from_table(structured_instruction)
+    if model_selection is not None:
+        log_event("LLM_SELECTION_SUCCESS",
+                 selected_model=model_selection.model_name,
+                 reasoning=model_selection.reasoning)
+        return model_selection
+    
     # Create LLM client for selection
-    llm = create_llm_client()
+    llm = get_llm_client()
     
     prompt = f"""You are an AI model selection expert. Analyze this agent configuration
 and recommend the optimal Google Gemini model.
@@ -43,34 +130,16 @@ Consider:
 - Specific capability needs (coding, reasoning, analysis)
 - Budget constraints
 
-IMPORTANT: You must choose from these Google Gemini models ONLY:
-- gemini-2.0-flash-exp (fastest, cheapest, good for simple tasks)
-- gemini-1.5-flash (balanced, 1M context window)
-- gemini-1.5-pro (most capable, best for complex reasoning)
-- gemini-pro (legacy, general purpose)
+{MODEL_CHOICES}
 
 Recommend ONE Gemini model with reasoning in JSON:
-{{
-    "model_name": "gemini-1.5-flash",
-    "context_window": 1000000,
-    "temperature": 0.7,
-    "reasoning": "why this specific Gemini model",
-    "estimated_cost_per_1k_tokens": 0.00015
-}}"""
+{SELECTION_EXAMPLE}"""
     
     try:
         # We need to construct the prompt to ask for JSON since our client expects it
         # The client's generate_json handles the call
         response = llm.generate_json(prompt, system_instruction="You are an expert AI architect.", schema={})
-        selection_data = response["parsed_json"]
-        
-        model_selection = ModelSelection(
-            model_name=selection_data["model_name"],
-            context_window=selection_data["context_window"],
-            temperature=selection_data["temperature"],
-            reasoning=selection_data["reasoning"],
-            estimated_cost_per_1k=selection_data["estimated_cost_per_1k_tokens"]
-        )
+        model_selection = parse_model_selection(response["parsed_json"])
         
         log_event("LLM_SELECTION_SUCCESS",
                  selected_model=model_selection.model_name,
@@ -79,4 +148,4 @@ Recommend ONE Gemini model with reasoning in JSON:
         return model_selection
         
     except Exception as e:
-        log_event("LLM_SELECTION_ERROR", error=str(e))
\ No newline at end of file
+        log_event("LLM_SELECTION_ERROR", error=str(e))
@@ -1,40 +1,115 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Optional
+import asyncio
 import json
-from google import genai
+import re
+import threading
+from functools import lru_cache
 from config import Config
+from utils.llm_cache import LLMCache
+from utils.jsonlib import loads as _loads
+
+# Opt-in check for response caching: a caching client stores a response only when
+# this returns truthy (raising counts as a rejection); without it nothing is cached
+AcceptFn = Callable[[Dict[str, Any]], Any]
+
+# Body of a ```json ... ``` (or bare ```) markdown fence; an unclosed fence runs to the end
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|\Z)", re.S)
+
 
 class LLMClient(ABC):
     @abstractmethod
-    def generate_json(self, prompt: str, system_instruction: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_json(
+        self,
+        prompt: str,
+        system_instruction: str,
+        schema: Dict[str, Any],
+        accept: Optional[AcceptFn] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a JSON response.
+
+        `accept` opts the call into response caching (see CachingLLMClient);
+        clients without a cache ignore it.
+        """
+        pass
+
+    async def agenerate_json(
+        self,
+        prompt: str,
+        system_instruction: str,
+        schema: Dict[str, Any],
+        accept: Optional[AcceptFn] = None
+    ) -> Dict[str, Any]:
+        """Async variant; providers without a native async API run the sync call in a worker thread."""
+        return await asyncio.to_thread(self.generate_json, prompt, system_instruction, schema, accept)
+
+    def close(self) -> None:
+        """Release any network resources held by the client."""
         pass
 
 
 class GoogleLLMClient(LLMClient):
     def __init__(self, api_key: str, model_name: str = "gemini-2.0-flash"):
+        # Imported here so the gRPC/protobuf stack only loads when a Google client is built
+        from google import genai
+
         self.model_name = model_name
         self.client = genai.Client(api_key=api_key)
 
-    def generate_json(self, prompt: str, system_instruction: str, schema: Dict[str, Any]) -> Dict[str, Any]:
-
-        # Use generate_content for google-genai SDK
-        # Combine system instruction and prompt for simplicity or use config if available
-        full_prompt = f"{system_instruction}\n\n{prompt}"
-        
+    def generate_json(
+        self,
+        prompt: str,
+        system_instruction: str,
+        schema: Dict[str, Any],
+        accept: Optional[AcceptFn] = None
+    ) -> Dict[str, Any]:
         response = self.client.models.generate_content(
             model=self.model_name,
-            contents=full_prompt
+            contents=prompt,
+            config=self._generation_config(system_instruction, schema)
         )
+        return self._parse_response(response)
 
+    async def agenerate_json(
+        self,
+        prompt: str,
+        system_instruction: str,
+        schema: Dict[str, Any],
+        accept: Optional[AcceptFn] = None
+    ) -> Dict[str, Any]:
+        response = await self.client.aio.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=self._generation_config(system_instruction, schema)
+        )
+        return self._parse_response(response)
+
+    def _generation_config(self, system_instruction: str, schema: Dict[str, Any]) -> Any:
+        return _build_generation_config(system_instruction, json.dumps(schema, sort_keys=True))
+
+    def _parse_response(self, response: Any) -> Dict[str, Any]:
         try:
-            text_response = response.text
+            # With a response_schema the SDK has already decoded the JSON
+            parsed = getattr(response, "parsed", None)
+            if isinstance(parsed, (dict, list)):
+                return {
+                    "parsed_json": parsed,
+                    "total_tokens": getattr(response, "usage", {}).get("total_tokens", 0),
+                    "cost_usd": 0.0,
+                    "model": self.model_name
+                }
 
-            if "```json" in text_response:
-                text_response = text_response.split("```json")[1].split("```")[0].strip()
-            elif "```" in text_response:
-                text_response = text_response.split("```")[1].split("```")[0].strip()
+            text_response = response.text
 
-            parsed_json = json.loads(text_response)
+            try:
+                parsed_json = _loads(text_response)
+            except ValueError:
+                # Fallback for models that still wrap the JSON in markdown fences
+                match = _FENCE.search(text_response)
+                if not match:
+                    raise
+                parsed_json = _loads(match.group(1).strip())
 
             return {
                 "parsed_json": parsed_json,
@@ -53,12 +128,186 @@ class GoogleLLMClient(LLMClient):
                 }
             raise ValueError(f"Failed to parse JSON from ADK response: {e}")
 
+    def close(self) -> None:
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+
+class CachingLLMClient(LLMClient):
+    """
+    Wraps any LLMClient and answers repeated identical requests from an LLMCache.
+    
+    Caching is opt-in per call: only calls that pass `accept` are looked up,
+    and a fresh response is stored only once accept(response) succeeds, so a
+    reply the caller cannot use is never replayed. Sampled calls whose
+    output should vary between runs (QA answers, grading) pass no `accept`
+    and always reach the provider. Hits report zero tokens and cost since no
+    API call was made.
+    """
+
+    def __init__(self, client: LLMClient, cache: LLMCache):
+        self.client = client
+        self.cache = cache
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.client, "model_name", "")
+
+    def _key(self, prompt: str, system_instruction: str, schema: Dict[str, Any]) -> str:
+        return LLMCache.make_key(self.model_name, system_instruction, prompt, schema)
+
+    def _hit(self, cached: Dict[str, Any]) -> Dict[str, Any]:
+        return {**cached, "total_tokens": 0, "cost_usd": 0.0}
+
+    def _store(self, key: str, result: Dict[str, Any], accept: AcceptFn) -> None:
+        try:
+            accepted = accept(result)
+        except Exception:
+            accepted = False
+        if accepted:
+            self.cache.set(key, result)
+
+    def generate_json(
+        self,
+        prompt: str,
+        system_instruction: str,
+        schema: Dict[str, Any],
+        accept: Optional[AcceptFn] = None
+    ) -> Dict[str, Any]:
+        if accept is None:
+            return self.client.generate_json(prompt, system_instruction, schema)
+
+        key = self._key(prompt, system_instruction, schema)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._hit(cached)
+
+        result = self.client.generate_json(prompt, system_instruction, schema)
+        self._store(key, result, accept)
+        return result
+
+    async def agenerate_json(
+        self,
+        prompt: str,
+        system_instruction: str,
+        schema: Dict[str, Any],
+        accept: Optional[AcceptFn] = None
+    ) -> Dict[str, Any]:
+        if accept is None:
+            return await self.client.agenerate_json(prompt, system_instruction, schema)
+
+        key = self._key(prompt, system_instruction, schema)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._hit(cached)
+
+        result = await self.client.agenerate_json(prompt, system_instruction, schema)
+        self._store(key, result, accept)
+        return result
+
+    def close(self) -> None:
+        self.client.close()
+
+
+@lru_cache(maxsize=128)
+def _build_generation_config(system_instruction: str, schema_json: str) -> Any:
+    """
+    Native JSON mode config, built once per (system instruction, schema).
+    
+    Usable schemas are compiled into a types.Schema here, so the SDK does not
+    re-convert the dict on every request and the server does constrained decoding.
+    """
+    from google.genai import types
+
+    schema = json.loads(schema_json)
+    return types.GenerateContentConfig(
+        response_mime_type="application/json",
+        system_instruction=system_instruction,
+        response_schema=_to_gemini_schema(schema) if _is_response_schema(schema) else None
+    )
+
+
+def _to_gemini_schema(schema: Dict[str, Any]) -> Any:
+    from google.genai import types
+
+    return types.Schema(
+        type=schema["type"].upper(),
+        properties={name: _to_gemini_schema(prop) for name, prop in schema["properties"].items()}
+        if "properties" in schema else None,
+        required=schema.get("required"),
+        items=_to_gemini_schema(schema["items"]) if "items" in schema else None,
+        enum=schema.get("enum")
+    )
+
+
+def _is_response_schema(schema: Dict[str, Any]) -> bool:
+    """
+    Gemini rejects empty schemas and OBJECT types without properties, so only
+    fully specified schemas are sent; others rely on JSON mode alone.
+    """
+    if not schema:
+        return False
+    if schema.get("type") == "object":
+        properties = schema.get("properties")
+        return bool(properties) and all(_is_response_schema(p) for p in properties.values())
+    if schema.get("type") == "array":
+        return _is_response_schema(schema.get("items", {}))
+    return True
+
+
+# One client per provider for the whole process, so every pipeline stage
+# reuses the same SDK client and its underlying HTTP connections.
+_clients: Dict[str, LLMClient] = {}
+_clients_lock = threading.Lock()
+_default_client: Optional[LLMClient] = None
+
 
 def create_llm_client(provider: str = None) -> LLMClient:
     if provider is None:
         provider = Config.LLM_PROVIDER
+    provider = provider.lower()
+
+    client = _clients.get(provider)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(provider)
+            if client is None:
+                client = _clients[provider] = _build_llm_client(provider)
+    return client
+
+
+def get_llm_client() -> LLMClient:
+    """
+    Shared client for the configured provider.
     
-    if provider.lower() == "google":
-        return GoogleLLMClient(api_key=Config.GOOGLE_API_KEY)
+    Pipeline stages call this per request; after the first call it is a
+    single global read, and the underlying SDK client keeps its HTTP
+    connection pool warm across calls.
+    """
+    global _default_client
+    client = _default_client
+    if client is None:
+        client = _default_client = create_llm_client()
+    return client
+
+
+def _build_llm_client(provider: str) -> LLMClient:
+    if provider == "google":
+        client = GoogleLLMClient(api_key=Config.GOOGLE_API_KEY)
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
+
+    cache = LLMCache(Config.LLM_CACHE_TTL, Config.LLM_CACHE_SIZE)
+    return CachingLLMClient(client, cache) if cache.enabled else client
+
+
+def close_clients() -> None:
+    """Close and forget every cached client (e.g. for test teardown)."""
+    global _default_client
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _default_client = None
+    for client in clients:
+        client.close()
@@ -1,6 +1,20 @@
 import sys
+import asyncio
 from core.genesis import genesis
 
+try:
+    # Faster event loop for the async genesis pipeline when available
+    from uvloop import new_event_loop as _new_event_loop
+except ImportError:
+    _new_event_loop = None
+
+def _run(coro):
+    """Run a coroutine on uvloop when installed, leaving the global loop policy untouched."""
+    if _new_event_loop is None:
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=_new_event_loop) as runner:
+        return runner.run(coro)
+
 def create_agent(instruction: str):
     """
     Genesis Agent: Entry point for dynamic agent creation.
@@ -19,7 +33,7 @@ def create_agent(instruction: str):
     """
 
     try:
-        result = genesis(instruction)
+        result = _run(genesis(instruction))
         print(result)
         return result
     except Exception as e:
@@ -1,29 +1,15 @@
-from typing import List, Dict, Any
-from llm.factory import create_llm_client
+import string
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
+from llm.factory import get_llm_client
 from utils.logger import log_event
 
 
-def generate_challenge_questions(
-    agent_type: str,
-    capabilities: List[str],
-    num_questions: int = 5
-) -> List[Dict[str, Any]]:
-    """
-    Generate challenge questions using Gemini (Challenger role in SPICE).
-    
-    Reference: SPICE paper (arXiv:2510.24684v1)
-    """
-    log_event("CHALLENGE_GENERATION_START",
-             agent_type=agent_type,
-             num_questions=num_questions)
-    
-    llm = create_llm_client()  # Higher temp for diversity handled in prompt or client config if supported
-    
-    prompt = f"""You are the Challenger in a SPICE self-play QA system.
-Generate {num_questions} challenging test questions for this agent:
+_CHALLENGE_PROMPT_TMPL = string.Template("""You are the Challenger in a SPICE self-play QA system.
+Generate $num_questions challenging test questions for this agent:
 
-Agent Type: {agent_type}
-Capabilities: {', '.join(capabilities)}
+Agent Type: $agent_type
+Capabilities: $caps
 
 Requirements:
 1. Questions should test the FRONTIER of capability (not too easy, not impossible)
@@ -34,14 +20,44 @@ Requirements:
 
 Return JSON array:
 [
-    {{
+    {
         "question": "test question",
         "expected_answer": "correct answer or key criteria",
         "difficulty": 0.0-1.0,
         "tests_capability": "which capability this tests"
-    }},
+    },
     ...
 ]"""
+)
+
+
+@lru_cache(maxsize=256)
+def join_capabilities(capabilities: Tuple[str, ...]) -> str:
+    """Comma-joined capability list for prompts, cached per capability set."""
+    return ", ".join(capabilities)
+
+
+def generate_challenge_questions(
+    agent_type: str,
+    capabilities: List[str],
+    num_questions: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    Generate challenge questions using Gemini (Challenger role in SPICE).
+    
+    Reference: SPICE paper (arXiv:2510.24684v1)
+    """
+    log_event("CHALLENGE_GENERATION_START",
+             agent_type=agent_type,
+             num_questions=num_questions)
+    
+    llm = get_llm_client()  # Higher temp for diversity handled in prompt or client config if supported
+    
+    prompt = _CHALLENGE_PROMPT_TMPL.substitute(
+        num_questions=num_questions,
+        agent_type=agent_type,
+        caps=join_capabilities(tuple(capabilities))
+    )
     
     try:
         response = llm.generate_json(prompt, system_instruction="You are a challenging QA tester.", schema={})
@@ -1,22 +1,129 @@
-from typing import Dict, Any, List
+import asyncio
+import json
+import string
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
-from utils.logger import log_event
-from llm.factory import create_llm_client
+from config import Config
+from utils.logger import log_event, log_event_raw, log_enabled
+from utils.stats import RunningStats
+from llm.factory import get_llm_client
 from core.llm_selector import ModelSelection
+from core.agent_setup import AgentConfig
+from qa.challenger import join_capabilities
 
-@dataclass
+# Sent as the response schema so the model returns well-formed questions
+QUESTIONS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "q": {"type": "string"},
+            "answer": {"type": "string"},
+            "difficulty": {"type": "number"},
+            "source": {"type": "string"}
+        },
+        "required": ["q", "answer"]
+    }
+}
+
+# Difficulty by slot (first, second, rest) and label cycling for filler questions
+_FALLBACK_DIFFICULTIES = (0.3, 0.6, 0.8)
+_FALLBACK_LABELS = ("basic", "intermediate", "advanced")
+
+_QUESTIONS_PROMPT_TMPL = string.Template("""Generate $num_questions technical interview questions for an AI agent.
+
+Role: $agent_type
+Capabilities: $caps
+
+REQUIREMENTS:
+1. Mix difficulty levels (easy 0.2-0.4, medium 0.5-0.6, hard 0.7-0.9)
+2. Base on real interview questions (Google, Amazon, StackOverflow, LeetCode)
+3. Target 50% pass rate overall
+4. Keep answers concise (1-2 sentences max)
+
+CRITICAL: Return ONLY valid JSON array. No markdown, no code blocks, no extra text.
+
+Example format:
+[
+  {"q": "Question text here", "answer": "Brief answer", "difficulty": 0.3, "source": "Google"},
+  {"q": "Another question", "answer": "Brief answer", "difficulty": 0.6, "source": "LeetCode"}
+]
+
+Generate $num_questions questions now:""")
+
+_ANSWER_PROMPT_TMPL = string.Template("""Answer this test question that evaluates your capabilities:
+
+Question: $question
+
+Provide a clear, concise answer. If you're unsure, explain your reasoning.""")
+
+_EVAL_PROMPT_TMPL = string.Template("""You are an expert evaluator. Compare the agent's response to the expected answer.
+
+Question: $question
+Expected Answer: $expected
+Agent's Response: $response
+
+Evaluate the agent's response on:
+1. Correctness: Does it answer the question correctly?
+2. Similarity: Is it semantically similar to the expected answer?
+3. Completeness: Does it cover the key points?
+
+Return JSON with:
+- "correct": boolean (true if the response is acceptable)
+- "score": float 0.0-1.0 (quality score)
+- "reasoning": string (brief explanation)
+""")
+
+_BATCH_EVAL_PROMPT_TMPL = string.Template("""You are an expert evaluator. Evaluate the following $count (question, expected answer, agent response) triples.
+
+For each triple, compare the agent's response to the expected answer on:
+1. Correctness: Does it answer the question correctly?
+2. Similarity: Is it semantically similar to the expected answer?
+3. Completeness: Does it cover the key points?
+
+$items
+
+Return a JSON array of exactly $count objects, in the same order as the triples, each with:
+- "correct": boolean (true if the response is acceptable)
+- "score": float 0.0-1.0 (quality score)
+- "reasoning": string (brief explanation)
+""")
+
+_BATCH_EVAL_ITEM_TMPL = string.Template("""[$index]
+Question: $question
+Expected Answer: $expected
+Agent's Response: $response""")
+
+BATCH_EVAL_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "correct": {"type": "boolean"},
+            "score": {"type": "number"},
+            "reasoning": {"type": "string"}
+        },
+        "required": ["correct", "score", "reasoning"]
+    }
+}
+
+@dataclass(slots=True, frozen=True)
 class QAResult:
     """Quality assurance test result"""
     passed: bool
-    scores: Dict[str, float]
+    scores: Dict[str, Any]
     reason: str
     feedback: str
 
-def quality_assurance_test(
-    agent_config: Dict[str, Any],
+def _llm_semaphore() -> asyncio.Semaphore:
+    """Bounds in-flight LLM calls; values below 1 would block forever (0) or raise, so clamp."""
+    return asyncio.Semaphore(max(1, Config.LLM_MAX_CONCURRENCY))
+
+async def quality_assurance_test(
+    agent_config: AgentConfig,
     llm_instance: ModelSelection,
     structured_instruction: Dict[str, Any]
-) -> Dict[str, Any]:
+) -> QAResult:
     """
     SPICE-inspired quality assurance using adversarial self-play.
     
@@ -25,30 +132,68 @@ def quality_assurance_test(
     
     Reference: SPICE paper (arXiv:2510.24684v1)
     """
-    log_event("QA_TEST_START", agent_id=agent_config["agent_id"])
+    qa_suite = await generate_challenge_questions(
+        agent_config.agent_type,
+        agent_config.capabilities,
+        num_questions=5
+    )
+    return await run_qa_suite(qa_suite, agent_config, llm_instance)
+
+async def build_qa_suite(structured_instruction: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Generate the challenge questions (Challenger role) for a structured instruction.
     
-    # Generate challenge questions (Challenger role)
-    challenge_questions = generate_challenge_questions(
-        agent_config["agent_type"],
-        agent_config["capabilities"],
+    The suite only depends on the original instruction, so genesis builds it
+    once and every retry attempt is scored against the same questions.
+    """
+    return await generate_challenge_questions(
+        structured_instruction.get("agent_type", "general"),
+        structured_instruction.get("capabilities", []),
         num_questions=5
     )
+
+async def run_qa_suite(
+    challenge_questions: List[Dict[str, Any]],
+    agent_config: AgentConfig,
+    llm_instance: ModelSelection
+) -> QAResult:
+    """
+    Have the agent answer a prebuilt challenge suite and score it (Reasoner role).
+    
+    All answers are requested concurrently, then all evaluations, bounded by
+    LLM_MAX_CONCURRENCY in-flight calls to respect provider rate limits.
+    """
+    log_event("QA_TEST_START", agent_id=agent_config.agent_id)
+    
+    semaphore = _llm_semaphore()
+    
+    async def answer(question: Dict[str, Any]) -> str:
+        log_event_raw("QA_QUESTION", {"question": question})
+        async with semaphore:
+            return await simulate_agent_response(agent_config, question, llm_instance)
     
     # Agent attempts to answer (Reasoner role)
-    responses = []
-    for question in challenge_questions:
-        log_event("QA_QUESTION", question=question)
-        response = simulate_agent_response(agent_config, question, llm_instance)
-        responses.append(response)
+    responses = await asyncio.gather(*(answer(question) for question in challenge_questions))
     
     # Score responses
-    scores = evaluate_responses(responses, challenge_questions)
+    scores = await evaluate_responses(responses, challenge_questions, semaphore)
     
-    # Calculate variance (SPICE-inspired metric)
-    correctness_variance = calculate_variance([s["correct"] for s in scores])
+    # Mean score and correctness variance (SPICE-inspired metric) in one pass
+    score_stats = RunningStats()
+    correctness_stats = RunningStats()
+    for s in scores:
+        score_stats.add(s["score"])
+        correctness_stats.add(float(s["correct"]))
+    
+    avg_score = score_stats.mean
+    correctness_variance = correctness_stats.variance
+    
+    log_event("VARIANCE_CALCULATED", 
+             pass_rate=correctness_stats.mean, 
+             variance=correctness_variance,
+             optimal_range="0.15-0.35")
     
     # Quality thresholds
-    avg_score = sum(s["score"] for s in scores) / len(scores)
     min_acceptable_score = 0.6
     optimal_variance_range = (0.15, 0.35)  # Near 0.25 for 50% pass rate
     
@@ -57,26 +202,42 @@ def quality_assurance_test(
         optimal_variance_range[0] <= correctness_variance <= optimal_variance_range[1]
     )
     
-    qa_result = {
-        "passed": passed,
-        "scores": {
+    qa_result = QAResult(
+        passed=passed,
+        scores={
             "average": avg_score,
             "variance": correctness_variance,
             "individual": scores
         },
-        "reason": generate_qa_reason(passed, avg_score, correctness_variance),
-        "feedback": generate_qa_feedback(scores, agent_config)
-    }
+        reason=generate_qa_reason(passed, avg_score, correctness_variance),
+        feedback=generate_qa_feedback(scores, agent_config)
+    )
     
     log_event("QA_TEST_COMPLETE",
-             agent_id=agent_config["agent_id"],
+             agent_id=agent_config.agent_id,
              passed=passed,
              avg_score=avg_score,
              variance=correctness_variance)
     
     return qa_result
 
-def generate_challenge_questions(
+def _extract_questions(questions: Any) -> List[Dict[str, Any]]:
+    """Well-formed questions from a generation reply, normalized."""
+    if not isinstance(questions, list):
+        # Try to extract from string if needed
+        if isinstance(questions, str):
+            questions = json.loads(questions)
+        else:
+            questions = [questions]
+
+    return [
+        _normalize_question(q)
+        for q in questions
+        if isinstance(q, dict) and "q" in q and "answer" in q
+    ]
+
+
+async def generate_challenge_questions(
     agent_type: str,
     capabilities: List[str],
     num_questions: int = 5
@@ -90,75 +251,37 @@ def generate_challenge_questions(
     """
     log_event("QA_GENERATION_START", agent_type=agent_type, num_questions=num_questions)
     
-    llm = create_llm_client()
+    llm = get_llm_client()
     
     # SPICE-inspired prompt: request questions at the frontier of capability
-    prompt = f"""Generate {num_questions} technical interview questions for an AI agent.
-
-Role: {agent_type}
-Capabilities: {', '.join(capabilities)}
-
-REQUIREMENTS:
-1. Mix difficulty levels (easy 0.2-0.4, medium 0.5-0.6, hard 0.7-0.9)
-2. Base on real interview questions (Google, Amazon, StackOverflow, LeetCode)
-3. Target 50% pass rate overall
-4. Keep answers concise (1-2 sentences max)
-
-CRITICAL: Return ONLY valid JSON array. No markdown, no code blocks, no extra text.
-
-Example format:
-[
-  {{"q": "Question text here", "answer": "Brief answer", "difficulty": 0.3, "source": "Google"}},
-  {{"q": "Another question", "answer": "Brief answer", "difficulty": 0.6, "source": "LeetCode"}}
-]
-
-Generate {num_questions} questions now:"""
+    prompt = _QUESTIONS_PROMPT_TMPL.substitute(
+        num_questions=num_questions,
+        agent_type=agent_type,
+        caps=join_capabilities(tuple(capabilities))
+    )
 
     try:
-        response = llm.generate_json(
+        # Cached only when the reply alone yields the full set, so a short one is retried next run
+        response = await llm.agenerate_json(
             prompt=prompt,
             system_instruction="Return only a valid JSON array. No markdown formatting. No code blocks.",
-            schema={"type": "array", "items": {"type": "object"}}
+            schema=QUESTIONS_SCHEMA,
+            accept=lambda r: len(_extract_questions(r["parsed_json"])) >= num_questions
         )
         
-        questions = response["parsed_json"]
-        
-        # Validate structure
-        if not isinstance(questions, list):
-            # Try to extract from string if needed
-            if isinstance(questions, str):
-                import json
-                questions = json.loads(questions)
-            else:
-                questions = [questions]
-            
-        valid_questions = []
-        for q in questions:
-            if isinstance(q, dict) and "q" in q and "answer" in q:
-                # Clean up any potential formatting issues
-                valid_questions.append({
-                    "q": str(q["q"]).strip(),
-                    "answer": str(q["answer"]).strip(),
-                    "difficulty": float(q.get("difficulty", 0.5)),
-                    "source": str(q.get("source", "Generated")).strip()
-                })
+        valid_questions = _extract_questions(response["parsed_json"])
         
         # Verify we have enough questions
         if len(valid_questions) < num_questions:
             log_event("QA_GENERATION_WARNING", 
                      expected=num_questions, 
                      received=len(valid_questions),
-                     message="Falling back to ensure minimum questions")
+                     detail="Falling back to ensure minimum questions")
             
             # Add fallback questions to reach target
-            while len(valid_questions) < num_questions:
-                difficulty = 0.3 if len(valid_questions) == 0 else (0.6 if len(valid_questions) == 1 else 0.8)
-                valid_questions.append({
-                    "q": f"Explain a {['basic', 'intermediate', 'advanced'][len(valid_questions) % 3]} concept related to {agent_type}",
-                    "answer": "Detailed technical explanation",
-                    "difficulty": difficulty,
-                    "source": "Fallback"
-                })
+            valid_questions.extend(
+                _make_fallback(i, agent_type) for i in range(len(valid_questions), num_questions)
+            )
         
         result_questions = valid_questions[:num_questions]
         
@@ -195,105 +318,195 @@ Generate {num_questions} questions now:"""
             }
         ][:num_questions]
 
-def simulate_agent_response(agent_config: Dict[str, Any], question: Dict[str, Any], llm_instance: ModelSelection) -> str:
+def _normalize_question(q: Dict[str, Any]) -> Dict[str, Any]:
+    """Clean up any potential formatting issues in a generated question."""
+    return {
+        "q": str(q["q"]).strip(),
+        "answer": str(q["answer"]).strip(),
+        "difficulty": float(q.get("difficulty", 0.5)),
+        "source": str(q.get("source", "Generated")).strip()
+    }
+
+def _make_fallback(index: int, agent_type: str) -> Dict[str, Any]:
+    """Filler question for slot `index` when the LLM returned too few valid ones."""
+    return {
+        "q": f"Explain a {_FALLBACK_LABELS[index % 3]} concept related to {agent_type}",
+        "answer": "Detailed technical explanation",
+        "difficulty": _FALLBACK_DIFFICULTIES[min(index, 2)],
+        "source": "Fallback"
+    }
+
+async def simulate_agent_response(agent_config: AgentConfig, question: Dict[str, Any], llm_instance: ModelSelection) -> str:
     """
     Agent responds to challenge question using the selected LLM model.
     """
-    log_event("AGENT_RESPONSE_START", 
-             agent_id=agent_config["agent_id"],
-             question=question["q"][:100])
+    if log_enabled("AGENT_RESPONSE_START"):
+        log_event("AGENT_RESPONSE_START", 
+                 agent_id=agent_config.agent_id,
+                 question=question["q"][:100])
     
     # Create LLM client using the selected model
-    llm = create_llm_client()
+    llm = get_llm_client()
     
     # Use agent's system prompt
-    system_instruction = agent_config["system_prompt"]
+    system_instruction = agent_config.system_prompt
     
     # Format the question
-    prompt = f"""Answer this test question that evaluates your capabilities:
-
-Question: {question['q']}
-
-Provide a clear, concise answer. If you're unsure, explain your reasoning."""
+    prompt = _ANSWER_PROMPT_TMPL.substitute(question=question["q"])
     
     try:
         # Ask for JSON response with a "text" field
         prompt += "\n\nReturn your answer in JSON format: {\"text\": \"your answer\"}"
-        response = llm.generate_json(prompt, system_instruction, schema={})
+        response = await llm.agenerate_json(prompt, system_instruction, schema={})
         
         log_event("AGENT_RESPONSE_SUCCESS",
-                 agent_id=agent_config["agent_id"],
+                 agent_id=agent_config.agent_id,
                  response_length=len(response["parsed_json"]["text"]))
         
         return response["parsed_json"]["text"]
         
     except Exception as e:
         log_event("AGENT_RESPONSE_ERROR",
-                 agent_id=agent_config["agent_id"],
+                 agent_id=agent_config.agent_id,
                  error=str(e))
         return f"Error generating response: {e}"
 
-def evaluate_responses(
+async def evaluate_responses(
     responses: List[str],
-    questions: List[Dict[str, Any]]
+    questions: List[Dict[str, Any]],
+    semaphore: Optional[asyncio.Semaphore] = None
 ) -> List[Dict[str, Any]]:
     """
     Evaluate agent responses against expected answers using LLM-based semantic similarity.
+    
+    All pairs are graded in a single batched call; if that call fails or returns
+    the wrong number of grades, each pair is graded concurrently on its own.
+    Results keep question order.
     """
-    scores = []
-    llm = create_llm_client()
+    if semaphore is None:
+        semaphore = _llm_semaphore()
+    llm = get_llm_client()
+    
+    results = await _evaluate_batch(llm, responses, questions, semaphore)
+    if results is None:
+        results = await asyncio.gather(*(
+            _evaluate_response(llm, response, question, semaphore)
+            for response, question in zip(responses, questions)
+        ))
+    
+    # Pairs the LLM evaluator could not grade fall back to substring matching,
+    # done as one batch once every evaluation has settled
+    failed = [i for i, result in enumerate(results) if result is None]
+    if failed:
+        matches = substring_match_batch(
+            [questions[i]["answer"] for i in failed],
+            [responses[i] for i in failed]
+        )
+        for i, correct in zip(failed, matches):
+            results[i] = _score_entry(questions[i], correct, 1.0 if correct else 0.0)
     
-    for response, question in zip(responses, questions):
-        # Use LLM to evaluate semantic similarity and accuracy
-        eval_prompt = f"""You are an expert evaluator. Compare the agent's response to the expected answer.
+    return results
 
-Question: {question['q']}
-Expected Answer: {question['answer']}
-Agent's Response: {response}
+def substring_match_batch(answers: List[str], responses: List[str]) -> List[bool]:
+    """
+    Case-insensitive check that each expected answer occurs in its response.
+    
+    Lowercasing is hoisted out of the comparison so each string is folded once.
+    """
+    lowered_answers = [answer.lower() for answer in answers]
+    lowered_responses = [response.lower() for response in responses]
+    return [answer in response for answer, response in zip(lowered_answers, lowered_responses)]
 
-Evaluate the agent's response on:
-1. Correctness: Does it answer the question correctly?
-2. Similarity: Is it semantically similar to the expected answer?
-3. Completeness: Does it cover the key points?
+async def _evaluate_batch(
+    llm: Any,
+    responses: List[str],
+    questions: List[Dict[str, Any]],
+    semaphore: asyncio.Semaphore
+) -> Optional[List[Optional[Dict[str, Any]]]]:
+    """One rubric-grading round-trip for every pair; None means use the per-item path."""
+    items = "\n\n".join(
+        _BATCH_EVAL_ITEM_TMPL.substitute(
+            index=i + 1,
+            question=question["q"],
+            expected=question["answer"],
+            response=response
+        )
+        for i, (response, question) in enumerate(zip(responses, questions))
+    )
+    eval_prompt = _BATCH_EVAL_PROMPT_TMPL.substitute(count=len(questions), items=items)
+    
+    try:
+        async with semaphore:
+            eval_response = await llm.agenerate_json(
+                prompt=eval_prompt,
+                system_instruction="You are a strict but fair evaluator.",
+                schema=BATCH_EVAL_SCHEMA
+            )
+        grades = eval_response["parsed_json"]
+    except Exception as e:
+        log_event("EVALUATION_ERROR", error=str(e), batch_size=len(questions))
+        return None
+    
+    if not isinstance(grades, list) or len(grades) != len(questions):
+        log_event("EVALUATION_WARNING",
+                 expected=len(questions),
+                 received=len(grades) if isinstance(grades, list) else None,
+                 detail="Batched grading mismatch, grading each response separately")
+        return None
+    
+    # Malformed entries are left as None for the substring-match fallback
+    n = len(questions)
+    scores: List[Optional[Dict[str, Any]]] = [None] * n
+    for i in range(n):
+        grade = grades[i]
+        if isinstance(grade, dict):
+            scores[i] = _score_entry(questions[i], grade.get("correct", False), grade.get("score", 0.0))
+    return scores
 
-Return JSON with:
-- "correct": boolean (true if the response is acceptable)
-- "score": float 0.0-1.0 (quality score)
-- "reasoning": string (brief explanation)
-"""
+async def _evaluate_response(
+    llm: Any,
+    response: str,
+    question: Dict[str, Any],
+    semaphore: asyncio.Semaphore
+) -> Optional[Dict[str, Any]]:
+    # Use LLM to evaluate semantic similarity and accuracy
+    eval_prompt = _EVAL_PROMPT_TMPL.substitute(
+        question=question["q"],
+        expected=question["answer"],
+        response=response
+    )
         
-        try:
-            eval_response = llm.generate_json(
+    try:
+        async with semaphore:
+            eval_response = await llm.agenerate_json(
                 prompt=eval_prompt,
                 system_instruction="You are a strict but fair evaluator.",
                 schema={}
             )
             
-            result = eval_response["parsed_json"]
-            correct = result.get("correct", False)
-            score = result.get("score", 0.0)
+        result = eval_response["parsed_json"]
+        return _score_entry(question, result.get("correct", False), result.get("score", 0.0))
             
-        except Exception as e:
-            log_event("EVALUATION_ERROR", error=str(e))
-            # Fallback to simple substring matching
-            correct = question["answer"].lower() in response.lower()
-            score = 1.0 if correct else 0.0
-        
-        scores.append({
-            "question": question["q"],
-            "correct": correct,
-            "score": score,
-            "difficulty": question["difficulty"]
-        })
-    
-    return scores
+    except Exception as e:
+        log_event("EVALUATION_ERROR", error=str(e))
+        # Graded by substring matching in evaluate_responses
+        return None
+
+def _score_entry(question: Dict[str, Any], correct: bool, score: float) -> Dict[str, Any]:
+    return {
+        "question": question["q"],
+        "correct": correct,
+        "score": score,
+        "difficulty": question["difficulty"]
+    }
 
 def calculate_variance(binary_outcomes: List[bool]) -> float:
     """
     Calculate variance of binary outcomes (Bernoulli variance).
     
     SPICE Framework:
-    - Variance = p(1-p) where p is the success rate
+    - Variance = p(1-p) where p is the success rate (computed with Welford's
+      single-pass update, see utils.stats.RunningStats)
     - Optimal variance ~0.25 (when p=0.5, i.e., 50% pass rate)
     - This indicates questions are at the frontier of capability
     - Too low variance (0.0 or near 1.0) means questions are too easy or too hard
@@ -301,11 +514,13 @@ def calculate_variance(binary_outcomes: List[bool]) -> float:
     if not binary_outcomes:
         return 0.0
     
-    p = sum(binary_outcomes) / len(binary_outcomes)
-    variance = p * (1 - p)
+    stats = RunningStats()
+    for outcome in binary_outcomes:
+        stats.add(float(outcome))
+    variance = stats.variance
     
     log_event("VARIANCE_CALCULATED", 
-             pass_rate=p, 
+             pass_rate=stats.mean, 
              variance=variance,
              optimal_range="0.15-0.35")
     
@@ -340,7 +555,7 @@ def generate_qa_reason(passed: bool, avg_score: float, variance: float) -> str:
     return (f"Agent passed all quality checks "
            f"(avg={avg_score:.2f}, variance={variance:.3f} ≈ 0.25)")
 
-def generate_qa_feedback(scores: List[Dict], agent_config: Dict) -> str:
+def generate_qa_feedback(scores: List[Dict], agent_config: AgentConfig) -> str:
     """
     Generate actionable feedback for improvement based on SPICE analysis.
     
@@ -349,7 +564,16 @@ def generate_qa_feedback(scores: List[Dict], agent_config: Dict) -> str:
     - Difficulty levels of failed questions
     - Patterns in failures
     """
-    failed_questions = [s for s in scores if not s["correct"]]
+    # Bucket failures by difficulty in a single pass
+    failed_questions, failed_easy, failed_hard = [], [], []
+    for s in scores:
+        if s["correct"]:
+            continue
+        failed_questions.append(s)
+        if s["difficulty"] < 0.5:
+            failed_easy.append(s)
+        elif s["difficulty"] >= 0.7:
+            failed_hard.append(s)
     
     if not failed_questions:
         # Check if variance is good
@@ -359,10 +583,6 @@ def generate_qa_feedback(scores: List[Dict], agent_config: Dict) -> str:
                    "questions are too easy. Consider increasing difficulty.")
         return "Performance is optimal - continue with current difficulty level"
     
-    # Analyze failure patterns
-    failed_easy = [q for q in failed_questions if q["difficulty"] < 0.5]
-    failed_hard = [q for q in failed_questions if q["difficulty"] >= 0.7]
-    
     feedback_parts = []
     
     if failed_easy:
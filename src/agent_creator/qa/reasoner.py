@@ -1,24 +1,25 @@
 from typing import Dict, Any
-from ..llm.factory import create_llm_client
+from ..llm.factory import get_llm_client
 from ..utils.logger import log_event
+from ..core.agent_setup import AgentConfig
 
 
 def agent_response_to_challenge(
-    agent_config: Dict[str, Any],
+    agent_config: AgentConfig,
     question: Dict[str, Any]
 ) -> str:
     """
     Agent attempts to answer challenge question (Reasoner role in SPICE).
     """
     log_event("AGENT_RESPONSE_START",
-             agent_id=agent_config["agent_id"],
+             agent_id=agent_config.agent_id,
              question=question["question"][:100])
     
     # Create LLM client with agent's configuration
-    llm = create_llm_client()
+    llm = get_llm_client()
     
     # Use agent's system prompt
-    system_instruction = agent_config["system_prompt"]
+    system_instruction = agent_config.system_prompt
     
     # Format question
     prompt = f"""Answer this test question that evaluates your capabilities:
@@ -35,13 +36,13 @@ Provide a clear, concise answer. If you're unsure, explain your reasoning."""
         response = llm.generate_json(prompt, system_instruction, schema={})
         
         log_event("AGENT_RESPONSE_SUCCESS",
-                 agent_id=agent_config["agent_id"],
+                 agent_id=agent_config.agent_id,
                  response_length=len(response["parsed_json"]["text"]))
         
         return response["parsed_json"]["text"]
         
     except Exception as e:
         log_event("AGENT_RESPONSE_ERROR",
-                 agent_id=agent_config["agent_id"],
+                 agent_id=agent_config.agent_id,
                  error=str(e))
         return f"Error generating response: {e}"
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""JSON encode/decode using orjson when installed, stdlib json otherwise."""
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    loads = orjson.loads
+
+    def dumps(data: Any, indent: bool = False) -> str:
+        """Serialize with sorted keys; compact unless indent is set."""
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option).decode()
+except ImportError:  # optional speedup; stdlib json is the fallback
+    loads = json.loads
+
+    def dumps(data: Any, indent: bool = False) -> str:
+        """Serialize with sorted keys; compact unless indent is set."""
+        if indent:
+            return json.dumps(data, indent=2, sort_keys=True)
+        return json.dumps(data, sort_keys=True, separators=(",", ":"))
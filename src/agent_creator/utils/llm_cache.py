@@ -0,0 +1,63 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+class LLMCache:
+    """
+    In-memory LRU cache for LLM responses with a time-to-live.
+
+    Entries are keyed on a SHA-256 of the canonicalized request, so identical
+    (model, system instruction, prompt, schema) calls are answered without
+    another API round-trip. A ttl_seconds of 0 disables caching.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    @staticmethod
+    def make_key(model: str, system_instruction: str, prompt: str, schema: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            {"model": model, "system": system_instruction, "prompt": prompt, "schema": schema},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Callers mutate the parsed JSON (e.g. adding _metadata), so hand out copies
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
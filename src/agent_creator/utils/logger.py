@@ -1,11 +1,17 @@
+import atexit
 import json
+import queue
 import uuid
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import logging.handlers
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 import os
+from config import Config
+from utils.jsonlib import dumps as _dumps
 
 # Configure structured logging
 logging.basicConfig(
@@ -13,6 +19,15 @@ logging.basicConfig(
     format='%(message)s'
 )
 logger = logging.getLogger(__name__)
+_level = logging.getLevelNamesMapping().get(Config.LOG_LEVEL.upper())
+if _level is None:
+    # A typo in LOG_LEVEL should not stop the app from importing
+    logger.warning("Unknown LOG_LEVEL %r, falling back to INFO", Config.LOG_LEVEL)
+    _level = logging.INFO
+logger.setLevel(_level)
+
+# Colored, indented console output is opt-in; by default each event is one compact JSON line
+_PRETTY = Config.AGENT_LOGS_PRETTY
 
 class Colors:
     HEADER = '\033[95m'
@@ -25,38 +40,156 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
-def log_event(message: str, **data):
+# Event tags end in an outcome suffix; anything else renders in the default color
+_TAG_COLORS = {
+    "START": Colors.CYAN,
+    "SUCCESS": Colors.GREEN,
+    "PASSED": Colors.GREEN,
+    "ERROR": Colors.FAIL,
+    "FAIL": Colors.FAIL,
+    "FAILED": Colors.FAIL,
+    "WARNING": Colors.WARNING
+}
+
+# Per-question chatter; visible with LOG_LEVEL=DEBUG
+_DEBUG_TAGS = frozenset({
+    "QA_QUESTION",
+    "AGENT_RESPONSE_START",
+    "AGENT_RESPONSE_SUCCESS",
+    "VARIANCE_CALCULATED"
+})
+
+# Outcome suffixes that are more severe than INFO
+_SUFFIX_LEVELS = {
+    "ERROR": logging.ERROR,
+    "FAIL": logging.WARNING,
+    "FAILED": logging.WARNING,
+    "EXHAUSTED": logging.WARNING,
+    "WARNING": logging.WARNING
+}
+
+@lru_cache(maxsize=256)
+def event_level(message: str) -> int:
+    """Logging level an event tag is emitted at."""
+    if message in _DEBUG_TAGS:
+        return logging.DEBUG
+    return _SUFFIX_LEVELS.get(message.rsplit("_", 1)[-1], logging.INFO)
+
+def log_enabled(level: Union[int, str] = logging.INFO) -> bool:
+    """
+    True when events at this level (or with this event tag) will be emitted.
+    
+    Lets hot call sites skip building expensive log arguments (slices, large
+    dicts) when LOG_LEVEL filters them out anyway.
+    """
+    if isinstance(level, str):
+        level = event_level(level)
+    return logger.isEnabledFor(level)
+
+class _EventFormatter(logging.Formatter):
     """
-    Structured logging helper that outputs JSON-formatted logs with color for readability.
-    """
-    timestamp = datetime.utcnow().isoformat()
-    
-    log_entry = {
-        "timestamp": timestamp,
-        "message": message,
-        **data
-    }
-    
-    # Determine color based on message content or type
-    color = Colors.BLUE
-    if "ERROR" in message or "FAIL" in message:
-        color = Colors.FAIL
-    elif "SUCCESS" in message or "PASSED" in message:
-        color = Colors.GREEN
-    elif "WARNING" in message:
-        color = Colors.WARNING
-    elif "START" in message:
-        color = Colors.CYAN
+    Renders log_event records as one compact JSON object per line.
+    
+    Runs on the QueueListener thread, so JSON serialization stays off the
+    caller's path.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        data = getattr(record, "payload", None)
+        if data is None:
+            return super().format(record)
         
-    # Create a readable string for console output
-    readable_str = f"{Colors.BOLD}{color}[{timestamp}] {message}{Colors.ENDC}"
+        return _dumps({
+            "timestamp": _timestamp(record),
+            "message": record.getMessage(),
+            **data
+        })
+
+class _PrettyEventFormatter(_EventFormatter):
+    """
+    Colored, human-readable console form used when AGENT_LOGS_PRETTY is set.
     
-    if data:
-        readable_str += f"\n{color}" + json.dumps(data, indent=2) + f"{Colors.ENDC}\n"
-        readable_str += "-" * 50
+    Records from log_event_raw keep the compact form.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        data = getattr(record, "payload", None)
+        if data is None or getattr(record, "raw", False):
+            return super().format(record)
+        
+        message = record.getMessage()
+        
+        # Color by the event tag's outcome suffix (e.g. QA_TEST_START -> START)
+        color = _TAG_COLORS.get(message.rsplit("_", 1)[-1], Colors.BLUE)
+        
+        # Create a readable string for console output
+        readable_str = f"{Colors.BOLD}{color}[{_timestamp(record)}] {message}{Colors.ENDC}"
         
-    # Log the JSON for machine parsing (if needed) or just the readable string
-    # The user asked for easier to read logs, so we'll log the readable string
-    # If strict JSON logging is required for a system, we might want to separate console vs file logging
-    # For this request, we prioritize readability.
-    logger.info(readable_str)
\ No newline at end of file
+        if data:
+            readable_str += f"\n{color}" + _dumps(data, indent=True) + f"{Colors.ENDC}\n"
+            readable_str += "-" * 50
+        
+        return readable_str
+
+# Formatters only run on the listener thread, so this cache needs no lock
+_last_second: Optional[int] = None
+_last_prefix = ""
+
+def _timestamp(record: logging.LogRecord) -> str:
+    """
+    UTC ISO-8601 timestamp with microseconds for a record.
+    
+    The date/time prefix is formatted once per wall-clock second and reused;
+    only the fractional part is rendered per event.
+    """
+    global _last_second, _last_prefix
+    second = int(record.created)
+    if second != _last_second:
+        _last_prefix = datetime.fromtimestamp(second, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _last_second = second
+    return f"{_last_prefix}.{int((record.created - second) * 1_000_000):06d}"
+
+# Callers only enqueue; a single background listener formats and writes
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_PrettyEventFormatter() if _PRETTY else _EventFormatter())
+_log_listener = logging.handlers.QueueListener(_log_queue, _stream_handler, respect_handler_level=True)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.propagate = False
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+def log_event(message: str, **data):
+    """
+    Structured logging helper that outputs JSON-formatted logs (colorized when AGENT_LOGS_PRETTY is set).
+    
+    Only enqueues the record; formatting and the stream write happen on the
+    listener thread (see _EventFormatter). The level comes from the event tag
+    (see event_level), so LOG_LEVEL filters events without code changes.
+    
+    Payload values are held by reference and serialized later on the listener
+    thread: do not mutate them after the call (the log would show the later
+    state), and pass only JSON-serializable values (a bad value is reported
+    as a logging error on the listener thread, not raised here).
+    """
+    level = event_level(message)
+    
+    # Skip record creation entirely when filtered out
+    if not logger.isEnabledFor(level):
+        return
+    
+    logger.log(level, message, extra={"payload": data})
+
+def log_event_raw(message: str, data: Dict[str, Any]):
+    """
+    Leaner log_event for per-item hot loops (e.g. QA_QUESTION).
+    
+    Takes the payload dict as-is instead of repacking keyword arguments, and
+    is always written as a compact JSON line, even in pretty mode. The same
+    payload rules as log_event apply: `data` must not be mutated afterwards.
+    """
+    level = event_level(message)
+    if not logger.isEnabledFor(level):
+        return
+    
+    logger.log(level, message, extra={"payload": data, "raw": True})
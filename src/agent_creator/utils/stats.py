@@ -0,0 +1,42 @@
+
+class RunningStats:
+    """
+    Running mean and variance using Welford's online algorithm.
+
+    Values are folded in one at a time, so mean and variance come from a
+    single pass without the cancellation error of sum-of-squares formulas.
+    Partial results (e.g. from separate QA runs) combine with merge().
+    """
+
+    __slots__ = ("n", "mean", "M2")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.M2 = 0.0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.M2 += delta * (x - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Population variance (for 0/1 outcomes this is p(1-p))."""
+        return self.M2 / self.n if self.n else 0.0
+
+    @property
+    def sample_variance(self) -> float:
+        return self.M2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Combine two partitions with Chan et al.'s pairwise update."""
+        merged = RunningStats()
+        merged.n = self.n + other.n
+        if merged.n == 0:
+            return merged
+        delta = other.mean - self.mean
+        merged.mean = self.mean + delta * other.n / merged.n
+        merged.M2 = self.M2 + other.M2 + delta * delta * self.n * other.n / merged.n
+        return merged
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Application modules import each other relative to src/agent_creator (e.g. `from config import Config`)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "agent_creator"))
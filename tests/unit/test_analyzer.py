@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from core import analyzer
+
+STRUCTURED = {
+    "agent_type": "data_analyst",
+    "capabilities": ["csv parsing"],
+    "constraints": [],
+    "success_criteria": "Accurate summaries",
+}
+SELECTION = {
+    "model_name": "gemini-pro",
+    "context_window": 32000,
+    "temperature": 0.5,
+    "reasoning": "general purpose",
+    "estimated_cost_per_1k_tokens": 0.05,
+}
+
+
+def analyze(parsed_json):
+    client = mock.Mock()
+    client.agenerate_json = mock.AsyncMock(return_value={
+        "parsed_json": parsed_json,
+        "total_tokens": 10,
+        "cost_usd": 0.0,
+        "model": "test-model",
+    })
+    with mock.patch.object(analyzer, "get_llm_client", return_value=client):
+        return asyncio.run(analyzer.analyze_and_select("Build a CSV analysis agent"))
+
+
+class AnalyzeAndSelectTest(unittest.TestCase):
+    def test_table_selection_does_not_need_model_selection_block(self):
+        structured, selection = analyze({
+            "structured_instruction": {**STRUCTURED, "estimated_complexity": "medium"},
+        })
+
+        self.assertEqual(structured["agent_type"], "data_analyst")
+        self.assertEqual(selection.model_name, "gemini-1.5-flash")
+
+    def test_llm_selection_used_without_table_match(self):
+        _, selection = analyze({
+            "structured_instruction": STRUCTURED,
+            "model_selection": SELECTION,
+        })
+
+        self.assertEqual(selection.model_name, "gemini-pro")
+
+    def test_missing_model_selection_without_table_match_raises(self):
+        with self.assertRaisesRegex(ValueError, "model_selection"):
+            analyze({"structured_instruction": STRUCTURED})
+
+    def test_missing_structured_instruction_raises(self):
+        with self.assertRaisesRegex(ValueError, "structured_instruction"):
+            analyze({"model_selection": SELECTION})
+
+
+if __name__ == "__main__":
+    unittest.main()
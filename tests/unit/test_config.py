@@ -0,0 +1,31 @@
+import os
+import unittest
+from unittest import mock
+
+from config import clear_config_cache, get_config
+
+
+def load(**env):
+    clear_config_cache()
+    try:
+        with mock.patch.dict(os.environ, env):
+            return get_config()
+    finally:
+        clear_config_cache()
+
+
+class GetConfigTest(unittest.TestCase):
+    def test_bool_fields_parse_false_strings(self):
+        for raw in ("0", "false", "no", "off", ""):
+            self.assertFalse(load(AGENT_LOGS_PRETTY=raw).AGENT_LOGS_PRETTY, raw)
+
+    def test_bool_fields_parse_true_strings(self):
+        for raw in ("1", "true", "Yes", "ON"):
+            self.assertTrue(load(AGENT_LOGS_PRETTY=raw).AGENT_LOGS_PRETTY, raw)
+
+    def test_int_fields_are_coerced(self):
+        self.assertEqual(load(LLM_CACHE_SIZE="8").LLM_CACHE_SIZE, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
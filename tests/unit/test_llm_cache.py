@@ -0,0 +1,54 @@
+import unittest
+from unittest import mock
+
+from utils.llm_cache import LLMCache
+
+
+class LLMCacheTest(unittest.TestCase):
+    def test_entry_expires_after_ttl(self):
+        cache = LLMCache(ttl_seconds=10)
+        with mock.patch("utils.llm_cache.time.monotonic", return_value=100.0):
+            cache.set("k", {"v": 1})
+        with mock.patch("utils.llm_cache.time.monotonic", return_value=109.0):
+            self.assertEqual(cache.get("k"), {"v": 1})
+        with mock.patch("utils.llm_cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("k"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LLMCache(ttl_seconds=60, max_entries=2)
+        cache.set("a", {"v": "a"})
+        cache.set("b", {"v": "b"})
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", {"v": "c"})
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"v": "a"})
+        self.assertEqual(cache.get("c"), {"v": "c"})
+
+    def test_get_returns_independent_copies(self):
+        cache = LLMCache(ttl_seconds=60)
+        value = {"parsed_json": {"items": [1]}}
+        cache.set("k", value)
+        value["parsed_json"]["items"].append(2)
+
+        first = cache.get("k")
+        first["parsed_json"]["items"].append(3)
+
+        self.assertEqual(cache.get("k"), {"parsed_json": {"items": [1]}})
+
+    def test_zero_ttl_disables_cache(self):
+        cache = LLMCache(ttl_seconds=0)
+        cache.set("k", {"v": 1})
+
+        self.assertFalse(cache.enabled)
+        self.assertIsNone(cache.get("k"))
+
+    def test_make_key_ignores_schema_key_order(self):
+        key = LLMCache.make_key("m", "sys", "prompt", {"a": 1, "b": 2})
+
+        self.assertEqual(key, LLMCache.make_key("m", "sys", "prompt", {"b": 2, "a": 1}))
+        self.assertNotEqual(key, LLMCache.make_key("m", "sys", "other prompt", {"a": 1, "b": 2}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from types import SimpleNamespace
+
+from llm.factory import CachingLLMClient, GoogleLLMClient, LLMClient
+from utils.llm_cache import LLMCache
+
+
+def parse(text):
+    # _parse_response only needs model_name from the instance
+    client = GoogleLLMClient.__new__(GoogleLLMClient)
+    client.model_name = "test-model"
+    return client._parse_response(SimpleNamespace(parsed=None, text=text))["parsed_json"]
+
+
+class ParseResponseTest(unittest.TestCase):
+    def test_plain_json_with_fence_inside_a_string_value(self):
+        text = '{"text": "Use:\\n```python\\nprint(1)\\n```"}'
+
+        self.assertEqual(parse(text), {"text": "Use:\n```python\nprint(1)\n```"})
+
+    def test_fenced_json_falls_back_to_fence_body(self):
+        self.assertEqual(parse('```json\n{"a": 1}\n```'), {"a": 1})
+
+    def test_unclosed_fence(self):
+        self.assertEqual(parse('Here you go:\n```json\n[1, 2]'), [1, 2])
+
+    def test_unparseable_text_raises(self):
+        with self.assertRaises(ValueError):
+            parse("not json at all")
+
+
+class CountingClient(LLMClient):
+    model_name = "test-model"
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+
+    def generate_json(self, prompt, system_instruction, schema, accept=None):
+        self.calls += 1
+        return {"parsed_json": self.reply, "total_tokens": 7, "cost_usd": 0.1, "model": self.model_name}
+
+
+def call_twice(reply, accept):
+    inner = CountingClient(reply)
+    client = CachingLLMClient(inner, LLMCache(ttl_seconds=60))
+    for _ in range(2):
+        result = client.generate_json("prompt", "system", {}, accept=accept)
+    return inner.calls, result
+
+
+class CachingLLMClientTest(unittest.TestCase):
+    def test_accepted_reply_is_served_from_cache(self):
+        calls, result = call_twice({"text": "ok"}, accept=lambda r: "text" in r["parsed_json"])
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(result["total_tokens"], 0)
+
+    def test_rejected_reply_is_not_cached(self):
+        calls, _ = call_twice({"oops": 1}, accept=lambda r: "text" in r["parsed_json"])
+
+        self.assertEqual(calls, 2)
+
+    def test_accept_raising_counts_as_rejection(self):
+        calls, _ = call_twice({"oops": 1}, accept=lambda r: r["parsed_json"]["text"])
+
+        self.assertEqual(calls, 2)
+
+    def test_calls_without_accept_bypass_cache(self):
+        calls, _ = call_twice({"text": "ok"}, accept=None)
+
+        self.assertEqual(calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import dataclasses
+import unittest
+from unittest import mock
+
+from qa import qa_vet
+
+QUESTIONS = [
+    {"q": "What is 2 + 2?", "answer": "4", "difficulty": 0.3},
+    {"q": "What is the capital of France?", "answer": "Paris", "difficulty": 0.6},
+]
+RESPONSES = ["The answer is 4.", "I am not sure."]
+
+
+class StubClient:
+    """Answers the batched grading call and per-item grading calls separately."""
+
+    def __init__(self, batch_reply=None, batch_error=None, item_reply=None, item_error=None):
+        self.batch_reply = batch_reply
+        self.batch_error = batch_error
+        self.item_reply = item_reply
+        self.item_error = item_error
+        self.batch_calls = 0
+        self.item_calls = 0
+
+    async def agenerate_json(self, prompt, system_instruction, schema, accept=None):
+        if schema is qa_vet.BATCH_EVAL_SCHEMA:
+            self.batch_calls += 1
+            if self.batch_error:
+                raise self.batch_error
+            return {"parsed_json": self.batch_reply}
+        self.item_calls += 1
+        if self.item_error:
+            raise self.item_error
+        return {"parsed_json": self.item_reply}
+
+
+def evaluate(client):
+    with mock.patch.object(qa_vet, "get_llm_client", return_value=client):
+        return asyncio.run(qa_vet.evaluate_responses(RESPONSES, QUESTIONS))
+
+
+class EvaluateResponsesTest(unittest.TestCase):
+    def test_batch_grades_all_pairs_in_one_call(self):
+        client = StubClient(batch_reply=[
+            {"correct": True, "score": 0.9, "reasoning": "ok"},
+            {"correct": False, "score": 0.2, "reasoning": "wrong"},
+        ])
+
+        scores = evaluate(client)
+
+        self.assertEqual((client.batch_calls, client.item_calls), (1, 0))
+        self.assertEqual([s["correct"] for s in scores], [True, False])
+        self.assertEqual([s["score"] for s in scores], [0.9, 0.2])
+
+    def test_short_batch_falls_back_to_per_item_grading(self):
+        client = StubClient(
+            batch_reply=[{"correct": True, "score": 0.9, "reasoning": "ok"}],
+            item_reply={"correct": True, "score": 0.7, "reasoning": "ok"},
+        )
+
+        scores = evaluate(client)
+
+        self.assertEqual((client.batch_calls, client.item_calls), (1, 2))
+        self.assertEqual([s["score"] for s in scores], [0.7, 0.7])
+        self.assertEqual([s["question"] for s in scores], [q["q"] for q in QUESTIONS])
+
+    def test_batch_error_falls_back_to_per_item_grading(self):
+        client = StubClient(
+            batch_error=RuntimeError("evaluator down"),
+            item_reply={"correct": False, "score": 0.4, "reasoning": "partial"},
+        )
+
+        scores = evaluate(client)
+
+        self.assertEqual((client.batch_calls, client.item_calls), (1, 2))
+        self.assertEqual([s["correct"] for s in scores], [False, False])
+
+    def test_non_positive_concurrency_is_clamped(self):
+        client = StubClient(batch_reply=[
+            {"correct": True, "score": 0.9, "reasoning": "ok"},
+            {"correct": True, "score": 0.8, "reasoning": "ok"},
+        ])
+
+        for limit in (0, -3):
+            config = dataclasses.replace(qa_vet.Config, LLM_MAX_CONCURRENCY=limit)
+            with mock.patch.object(qa_vet, "Config", config):
+                scores = evaluate(client)
+            self.assertEqual(len(scores), 2)
+
+    def test_substring_match_when_every_evaluation_fails(self):
+        client = StubClient(
+            batch_error=RuntimeError("evaluator down"),
+            item_error=RuntimeError("evaluator down"),
+        )
+
+        scores = evaluate(client)
+
+        self.assertEqual([s["correct"] for s in scores], [True, False])
+        self.assertEqual([s["score"] for s in scores], [1.0, 0.0])
+
+
+class GenerateChallengeQuestionsTest(unittest.TestCase):
+    def test_short_reply_is_topped_up_with_fallback_questions(self):
+        client = mock.Mock()
+        client.agenerate_json = mock.AsyncMock(return_value={"parsed_json": [
+            {"q": " Explain joins ", "answer": "Combine rows", "difficulty": 0.5, "source": "Google"},
+            {"q": "Missing answer"},
+        ]})
+
+        with mock.patch.object(qa_vet, "get_llm_client", return_value=client):
+            questions = asyncio.run(qa_vet.generate_challenge_questions("analyst", ["sql"], num_questions=4))
+
+        self.assertEqual(len(questions), 4)
+        self.assertEqual(questions[0]["q"], "Explain joins")
+        self.assertEqual([q["source"] for q in questions], ["Google", "Fallback", "Fallback", "Fallback"])
+        self.assertEqual([q["difficulty"] for q in questions[1:]], [0.6, 0.8, 0.8])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import math
+import unittest
+
+from utils.stats import RunningStats
+from qa.qa_vet import calculate_variance
+
+
+def two_pass(values):
+    mean = sum(values) / len(values)
+    return mean, sum((x - mean) ** 2 for x in values) / len(values)
+
+
+def accumulate(values):
+    stats = RunningStats()
+    for x in values:
+        stats.add(x)
+    return stats
+
+
+class RunningStatsTest(unittest.TestCase):
+    VALUES = [0.9, 0.1, 0.75, 0.4, 1.0, 0.0, 0.55]
+
+    def test_matches_two_pass_mean_and_variance(self):
+        stats = accumulate(self.VALUES)
+        mean, variance = two_pass(self.VALUES)
+
+        self.assertEqual(stats.n, len(self.VALUES))
+        self.assertTrue(math.isclose(stats.mean, mean))
+        self.assertTrue(math.isclose(stats.variance, variance))
+        self.assertTrue(math.isclose(stats.sample_variance, variance * len(self.VALUES) / (len(self.VALUES) - 1)))
+
+    def test_merge_matches_single_accumulator(self):
+        mean, variance = two_pass(self.VALUES)
+
+        for split in range(len(self.VALUES) + 1):
+            merged = accumulate(self.VALUES[:split]).merge(accumulate(self.VALUES[split:]))
+            self.assertEqual(merged.n, len(self.VALUES))
+            self.assertTrue(math.isclose(merged.mean, mean))
+            self.assertTrue(math.isclose(merged.variance, variance))
+
+    def test_stable_with_large_offset(self):
+        values = [1e9 + x for x in (4.0, 7.0, 13.0, 16.0)]
+
+        self.assertTrue(math.isclose(accumulate(values).variance, 22.5))
+
+    def test_empty(self):
+        stats = RunningStats()
+
+        self.assertEqual((stats.mean, stats.variance, stats.sample_variance), (0.0, 0.0, 0.0))
+        self.assertEqual(stats.merge(RunningStats()).n, 0)
+
+
+class CalculateVarianceTest(unittest.TestCase):
+    def test_equals_bernoulli_variance(self):
+        for outcomes in ([True, False, True, True, False], [True] * 4, [False, True]):
+            p = sum(outcomes) / len(outcomes)
+            self.assertTrue(math.isclose(calculate_variance(outcomes), p * (1 - p), abs_tol=1e-12))
+
+    def test_empty(self):
+        self.assertEqual(calculate_variance([]), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()